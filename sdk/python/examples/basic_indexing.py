@@ -1,7 +1,28 @@
 """Basic indexing and querying example for GibRAM."""
 
+import asyncio
 import os
+from tqdm import tqdm
 from gibram import GibRAMIndexer
+from gibram.embedders import CachedEmbedder, OpenAIEmbedder
+
+# Embeddings are cached here, so re-running the example skips repeat API calls
+EMBEDDING_CACHE_PATH = os.path.expanduser("~/.gibram/embedding_cache.json")
+
+
+async def index_streaming(indexer, documents):
+    """Index documents, reporting progress as each one is stored."""
+    async for stats in indexer.index_stream(
+        documents, batch_size=5, show_progress=True, max_concurrent_batches=5
+    ):
+        if stats.documents_indexed:
+            # tqdm.write keeps messages from breaking the progress bar
+            tqdm.write(
+                f"  Stored document: {stats.text_units_created} text units, "
+                f"{stats.entities_extracted} new entities"
+            )
+    return indexer.get_stats()
+
 
 def main():
     # Set OpenAI API key (or use environment variable)
@@ -24,17 +45,24 @@ def main():
 
     # Initialize indexer
     print("Initializing GibRAM indexer...")
+    # The cache also holds indexing vectors; keep it small since save() rewrites
+    # the whole JSON file (~30 KB per 1536-d vector)
+    embedder = CachedEmbedder(
+        OpenAIEmbedder(api_key=api_key), max_size=500, cache_path=EMBEDDING_CACHE_PATH
+    )
     with GibRAMIndexer(
         session_id="einstein-demo",
         llm_api_key=api_key,
+        embedder=embedder,
         host="localhost",
         port=6161,
         chunk_size=256,  # Smaller chunks for this demo
+        # tokenizer="cl100k_base",  # Exact BPE chunking (pip install gibram[tiktoken])
         auto_detect_communities=True,
     ) as indexer:
         # Index documents
         print(f"\nIndexing {len(documents)} documents...")
-        stats = indexer.index_documents(documents, batch_size=5, show_progress=True)
+        stats = asyncio.run(index_streaming(indexer, documents))
 
         # Print stats
         print("\n=== Indexing Statistics ===")
@@ -68,6 +96,8 @@ def main():
 
             print(f"  Execution time: {result.execution_time_ms:.2f}ms\n")
 
+    embedder.save()
+
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,65 @@
-"""Example of custom extractor and embedder implementations."""
+"""
+Example of custom extractor and embedder implementations.
 
+Requires numpy: pip install gibram[examples]
+"""
+
+import hashlib
+import functools
+import itertools
 import os
 import re
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import replace
 from typing import List, Tuple
+
+import numpy as np
+
 from gibram import GibRAMIndexer
 from gibram.extractors import BaseExtractor
 from gibram.embedders import BaseEmbedder
 from gibram.types import ExtractedEntity, ExtractedRelationship
 
+# Person names (two capitalized words) or four-digit years, in one pass
+_ENTITY_RE = re.compile(
+    r"\b(?:(?P<person>[A-Z][a-z]+ [A-Z][a-z]+)|(?P<year>1[0-9]{3}|20[0-9]{2}))\b"
+)
+
+# Scale factor mapping an unsigned 32-bit word onto [0, 2)
+_WORD_SCALE = 2.0 / 2**32
+
+
+def _hash_vectors(texts: List[str], dimensions: int, nbytes: int) -> np.ndarray:
+    """Deterministic (len(texts), dimensions) float32 vectors from text hashes."""
+    # Generate deterministic "embedding" from text hash; a single
+    # extendable-output hash call yields bytes for every dimension
+    digests = b"".join(hashlib.shake_256(text.encode("utf-8")).digest(nbytes) for text in texts)
+
+    # Convert all digests at once: map 32-bit words to [-1, 1)
+    # (raw float32 bit patterns include NaN/Inf)
+    words = np.frombuffer(digests, dtype="<u4").reshape(len(texts), dimensions)
+    out = np.empty((len(texts), dimensions), dtype=np.float32)
+    np.multiply(words, _WORD_SCALE, out=out, casting="unsafe")
+    out -= 1.0
+    return out
+
+
+def quantize_int8(vectors: np.ndarray) -> np.ndarray:
+    """
+    Symmetric per-row int8 quantization (standalone helper, not used by GibRAM).
+
+    Each row is scaled so its largest magnitude maps to 127. The scale is not
+    returned: cosine similarity ignores per-vector scale, so the codes rank
+    the same as the rescaled vectors would. Useful for storing vectors compactly
+    outside GibRAM; the server itself stores float32, so passing codes to it
+    saves nothing.
+    """
+    peak = np.abs(vectors).max(axis=1)
+    scales = 127.0 / np.where(peak > 0, peak, 1.0)
+    return np.round(vectors * scales[:, None]).astype(np.int8)
+
 
 class SimpleRegexExtractor(BaseExtractor):
     """
@@ -17,13 +69,48 @@ class SimpleRegexExtractor(BaseExtractor):
     Production use should use LLM-based extraction.
     """
 
+    # Max results memoized across all instances (least recently used evicted)
+    CACHE_SIZE = 10_000
+
+    # (class, blake2b(text)) -> (entities, relationships); repeated chunks skip
+    # the scan. The class is part of the key because subclasses that override
+    # _extract_uncached() share this cache.
+    _cache: "OrderedDict[Tuple[type, bytes], Tuple[tuple, tuple]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
     def extract(self, text: str) -> Tuple[List[ExtractedEntity], List[ExtractedRelationship]]:
+        key = (type(self), hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        if cached is None:
+            # Scan outside the lock; concurrent misses on one text just race to store it
+            entities, relationships = self._extract_uncached(text)
+            cached = (tuple(entities), tuple(relationships))
+            with self._cache_lock:
+                self._cache[key] = cached
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        # Return copies so callers can't mutate cached results
+        entities, relationships = cached
+        return [replace(e) for e in entities], [replace(r) for r in relationships]
+
+    def _extract_uncached(
+        self, text: str
+    ) -> Tuple[List[ExtractedEntity], List[ExtractedRelationship]]:
         entities = []
-        relationships = []
 
-        # Extract person names (capitalized words)
-        person_pattern = r"\b([A-Z][a-z]+ [A-Z][a-z]+)\b"
-        persons = set(re.findall(person_pattern, text))
+        # Extract person names (capitalized words) and years in a single scan
+        persons = set()
+        years = set()
+        for match in _ENTITY_RE.finditer(text):
+            if match.lastgroup == "person":
+                persons.add(match.group("person"))
+            else:
+                years.add(match.group("year"))
 
         for person in persons:
             entities.append(
@@ -34,10 +121,6 @@ class SimpleRegexExtractor(BaseExtractor):
                 )
             )
 
-        # Extract years
-        year_pattern = r"\b(1[0-9]{3}|20[0-9]{2})\b"
-        years = set(re.findall(year_pattern, text))
-
         for year in years:
             entities.append(
                 ExtractedEntity(
@@ -47,19 +130,17 @@ class SimpleRegexExtractor(BaseExtractor):
                 )
             )
 
-        # Create relationships between persons and years
-        for person in persons:
-            for year in years:
-                if person in text and year in text:
-                    relationships.append(
-                        ExtractedRelationship(
-                            source_title=person,
-                            target_title=year,
-                            relationship_type="MENTIONED_IN",
-                            description=f"{person} mentioned in context of {year}",
-                            weight=0.5,
-                        )
-                    )
+        # Create relationships between persons and years (both were found in text)
+        relationships = [
+            ExtractedRelationship(
+                source_title=person,
+                target_title=year,
+                relationship_type="MENTIONED_IN",
+                description=f"{person} mentioned in context of {year}",
+                weight=0.5,
+            )
+            for person, year in itertools.product(persons, years)
+        ]
 
         return entities, relationships
 
@@ -75,32 +156,51 @@ class DummyEmbedder(BaseEmbedder):
     def __init__(self, dimensions: int = 1536):
         self.dimensions = dimensions
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        import hashlib
-        import struct
-
-        embeddings = []
-        for text in texts:
-            # Generate deterministic "embedding" from text hash
-            hash_obj = hashlib.sha256(text.encode())
-            hash_bytes = hash_obj.digest()
-
-            # Convert hash to floats
-            vec = []
-            for i in range(0, min(len(hash_bytes), self.dimensions * 4), 4):
-                chunk = hash_bytes[i : i + 4].ljust(4, b"\x00")
-                value = struct.unpack("f", chunk)[0]
-                vec.append(value)
-
-            # Pad to desired dimensions
-            while len(vec) < self.dimensions:
-                vec.append(0.0)
-
-            embeddings.append(vec[: self.dimensions])
-
-        return embeddings
-
-    def embed_single(self, text: str) -> List[float]:
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def specialize(cls, dimensions: int) -> type:
+        """
+        Return a subclass with dimensions fixed when the class is built.
+
+        embed() reads the shape and digest size from closure constants instead
+        of instance attributes. Classes are cached per dimensions, and their
+        constructor takes no arguments.
+
+        Example:
+            >>> Embedder1536 = DummyEmbedder.specialize(1536)
+            >>> embedder = Embedder1536()
+        """
+        nbytes = dimensions * 4
+        # Not cls.__init__: for an already specialized cls that takes no arguments
+        base_init = DummyEmbedder.__init__
+
+        def __init__(self):
+            base_init(self, dimensions)
+
+        def embed(self, texts: List[str]) -> np.ndarray:
+            return _hash_vectors(texts, dimensions, nbytes)
+
+        return type(
+            f"{cls.__name__}{dimensions}",
+            (cls,),
+            {
+                "__init__": __init__,
+                "embed": embed,
+                "__doc__": cls.__doc__,
+                "__module__": cls.__module__,
+            },
+        )
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return a (len(texts), dimensions) float32 matrix."""
+        return _hash_vectors(texts, self.dimensions, self.dimensions * 4)
+
+    def embed_single(self, text: str) -> np.ndarray:
+        warnings.warn(
+            "embed_single() is deprecated; pass a list of texts to embed()",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         return self.embed([text])[0]
 
 
@@ -124,7 +224,7 @@ def main():
     with GibRAMIndexer(
         session_id="custom-demo",
         extractor=SimpleRegexExtractor(),
-        embedder=DummyEmbedder(dimensions=1536),
+        embedder=DummyEmbedder.specialize(1536)(),
         host="localhost",
         port=6161,
     ) as indexer:
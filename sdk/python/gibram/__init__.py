@@ -14,6 +14,7 @@ from .indexer import GibRAMIndexer
 from .types import (
     IndexStats,
     QueryResult,
+    QueryCountResult,
     ScoredEntity,
     ScoredTextUnit,
     ScoredCommunity,
@@ -39,6 +40,7 @@ __all__ = [
     # Return types
     "IndexStats",
     "QueryResult",
+    "QueryCountResult",
     "ScoredEntity",
     "ScoredTextUnit",
     "ScoredCommunity",
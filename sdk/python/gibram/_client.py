@@ -1,11 +1,12 @@
 """Low-level GibRAM protocol client."""
 
 import struct
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from .proto import gibram_pb2 as pb
 from ._connection import _Connection
 from ._protocol import _Protocol
 from .exceptions import ServerError, ProtocolError
+from .types import QueryResult
 
 
 class _Client:
@@ -112,7 +113,7 @@ class _Client:
         external_id: str,
         document_id: int,
         content: str,
-        embedding: List[float],
+        embedding: Sequence[float],
         token_count: int,
     ) -> int:
         """
@@ -141,7 +142,7 @@ class _Client:
         title: str,
         entity_type: str,
         description: str,
-        embedding: List[float],
+        embedding: Sequence[float],
     ) -> int:
         """
         Add entity.
@@ -206,10 +207,10 @@ class _Client:
 
     def query(
         self,
-        query_vector: List[float],
+        query_vector: Sequence[float],
         search_types: List[str],
         top_k: int,
-    ) -> Dict[str, Any]:
+    ) -> QueryResult:
         """
         Execute vector query.
 
@@ -219,12 +220,33 @@ class _Client:
             top_k: Number of results
 
         Returns:
-            Query results with entities, textunits, communities
+            QueryResult with scored entities, text units, communities
         """
         req_payload = _Protocol.encode_query(query_vector, search_types, top_k)
         resp_payload = self._execute(pb.CommandType.CMD_QUERY, req_payload)
         return _Protocol.decode_query_response(resp_payload)
 
+    def query_counts(
+        self,
+        query_vector: Sequence[float],
+        search_types: List[str],
+        top_k: int,
+    ) -> Dict[str, Any]:
+        """
+        Execute vector query, returning only result counts.
+
+        Args:
+            query_vector: Query embedding vector
+            search_types: Types to search (["entity", "textunit", "community"])
+            top_k: Number of results
+
+        Returns:
+            Counts per result type and execution time
+        """
+        req_payload = _Protocol.encode_query(query_vector, search_types, top_k)
+        resp_payload = self._execute(pb.CommandType.CMD_QUERY, req_payload)
+        return _Protocol.decode_query_counts(resp_payload)
+
     def list_entities(self, cursor: int = 0, limit: int = 1000) -> Dict[str, Any]:
         """
         List entities in ID order with pagination.
@@ -1,10 +1,11 @@
 """GibRAM protobuf protocol encoder/decoder."""
 
 import struct
-from typing import Tuple, Optional, Any, Dict
+from typing import Tuple, Optional, Any, Dict, Sequence
 from enum import IntEnum
 from .proto import gibram_pb2 as pb
 from .exceptions import ProtocolError
+from .types import QueryResult, ScoredEntity, ScoredTextUnit, ScoredCommunity
 
 
 class CodecType(IntEnum):
@@ -113,7 +114,7 @@ class _Protocol:
         external_id: str,
         document_id: int,
         content: str,
-        embedding: list,
+        embedding: Sequence[float],
         token_count: int,
     ) -> bytes:
         """Encode ADD_TEXTUNIT request."""
@@ -141,7 +142,7 @@ class _Protocol:
 
     @staticmethod
     def encode_add_entity(
-        external_id: str, title: str, entity_type: str, description: str, embedding: list
+        external_id: str, title: str, entity_type: str, description: str, embedding: Sequence[float]
     ) -> bytes:
         """Encode ADD_ENTITY request."""
         req = pb.AddEntityRequest(
@@ -208,7 +209,7 @@ class _Protocol:
         return req.SerializeToString()
 
     @staticmethod
-    def encode_query(query_vector: list, search_types: list, top_k: int) -> bytes:
+    def encode_query(query_vector: Sequence[float], search_types: list, top_k: int) -> bytes:
         """Encode QUERY request."""
         req = pb.QueryRequest(
             query_vector=query_vector, search_types=search_types, top_k=top_k
@@ -228,58 +229,66 @@ class _Protocol:
         return req.SerializeToString()
 
     @staticmethod
-    def decode_query_response(payload: bytes) -> Dict[str, Any]:
-        """Decode QueryResponse."""
+    def decode_query_response(payload: bytes) -> QueryResult:
+        """Decode QueryResponse into a QueryResult."""
         resp = pb.QueryResponse()
         resp.ParseFromString(payload)
 
         entities = []
         for ent_result in resp.entities:
+            entity = ent_result.entity
             entities.append(
-                {
-                    "entity": {
-                        "id": ent_result.entity.id,
-                        "title": ent_result.entity.title,
-                        "type": ent_result.entity.type,
-                        "description": ent_result.entity.description,
-                    },
-                    "similarity": ent_result.similarity,
-                    "hop": ent_result.hop,
-                }
+                ScoredEntity(
+                    id=entity.id,
+                    title=entity.title,
+                    type=entity.type,
+                    description=entity.description,
+                    score=ent_result.similarity,
+                )
             )
 
         text_units = []
         for tu_result in resp.textunits:
+            textunit = tu_result.textunit
             text_units.append(
-                {
-                    "textunit": {
-                        "id": tu_result.textunit.id,
-                        "content": tu_result.textunit.content,
-                        "document_id": tu_result.textunit.document_id,
-                    },
-                    "similarity": tu_result.similarity,
-                    "hop": tu_result.hop,
-                }
+                ScoredTextUnit(
+                    id=textunit.id,
+                    content=textunit.content,
+                    document_id=textunit.document_id,
+                    score=tu_result.similarity,
+                )
             )
 
         communities = []
         for comm_result in resp.communities:
+            community = comm_result.community
             communities.append(
-                {
-                    "community": {
-                        "id": comm_result.community.id,
-                        "title": comm_result.community.title,
-                        "summary": comm_result.community.summary,
-                        "entity_ids": list(comm_result.community.entity_ids),
-                    },
-                    "similarity": comm_result.similarity,
-                }
+                ScoredCommunity(
+                    id=community.id,
+                    title=community.title,
+                    summary=community.summary,
+                    entity_count=len(community.entity_ids),
+                    score=comm_result.similarity,
+                )
             )
 
+        return QueryResult(
+            entities=entities,
+            text_units=text_units,
+            communities=communities,
+            execution_time_ms=resp.stats.duration_micros / 1000.0 if resp.stats else 0.0,
+        )
+
+    @staticmethod
+    def decode_query_counts(payload: bytes) -> Dict[str, Any]:
+        """Decode QueryResponse into result counts only (no per-result dicts)."""
+        resp = pb.QueryResponse()
+        resp.ParseFromString(payload)
+
         return {
-            "entities": entities,
-            "textunits": text_units,
-            "communities": communities,
+            "entity_count": len(resp.entities),
+            "text_unit_count": len(resp.textunits),
+            "community_count": len(resp.communities),
             "execution_time_ms": resp.stats.duration_micros / 1000.0 if resp.stats else 0.0,
         }
 
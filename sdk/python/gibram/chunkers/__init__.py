@@ -2,5 +2,6 @@
 
 from .base import BaseChunker
 from .token import TokenChunker
+from .tiktoken import TiktokenChunker
 
-__all__ = ["BaseChunker", "TokenChunker"]
+__all__ = ["BaseChunker", "TokenChunker", "TiktokenChunker"]
@@ -19,3 +19,18 @@ class BaseChunker(ABC):
             List of text chunks
         """
         pass
+
+    def chunk_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Split many texts into chunks.
+
+        Override when the chunker can process a batch faster than one
+        text at a time.
+
+        Args:
+            texts: Input texts to chunk
+
+        Returns:
+            List of chunk lists, one per input text
+        """
+        return [self.chunk(text) for text in texts]
@@ -0,0 +1,134 @@
+"""BPE token-based text chunker using tiktoken."""
+
+import os
+from typing import List, Optional
+from .base import BaseChunker
+from ..exceptions import ConfigurationError
+
+
+class TiktokenChunker(BaseChunker):
+    """
+    Token-based chunker using tiktoken BPE encodings.
+
+    Chunk sizes are counted in real model tokens rather than whitespace
+    tokens. Encoding runs in tiktoken's native core, and chunk_batch()
+    encodes many texts across threads without holding the GIL.
+
+    Requires the optional dependency: pip install gibram[tiktoken]
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 50,
+        encoding_name: str = "cl100k_base",
+        num_threads: Optional[int] = None,
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_size: Maximum tokens per chunk
+            chunk_overlap: Number of tokens to overlap between chunks
+            encoding_name: tiktoken encoding (cl100k_base matches OpenAI embedding models)
+            num_threads: Threads for batch encoding (default: CPU count)
+
+        Raises:
+            ConfigurationError: If tiktoken is not installed
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if chunk_overlap < 0:
+            raise ValueError("chunk_overlap must be non-negative")
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be less than chunk_size")
+
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ConfigurationError(
+                "TiktokenChunker requires tiktoken. Install with: pip install gibram[tiktoken]"
+            ) from e
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.encoding_name = encoding_name
+        self.num_threads = num_threads or os.cpu_count() or 1
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def chunk(self, text: str) -> List[str]:
+        """
+        Chunk text with sliding token window and overlap.
+
+        Args:
+            text: Input text
+
+        Returns:
+            List of text chunks
+        """
+        if not text or not text.strip():
+            return []
+
+        # Special-token strings in documents are plain text, not control tokens
+        tokens = self._encoding.encode(text, disallowed_special=())
+        return self._split(tokens)
+
+    def chunk_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Chunk many texts, encoding them in parallel.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            List of chunk lists, one per input text
+        """
+        token_lists = self._encoding.encode_batch(
+            texts, num_threads=self.num_threads, disallowed_special=()
+        )
+        return [
+            self._split(tokens) if text.strip() else [] for text, tokens in zip(texts, token_lists)
+        ]
+
+    def _split(self, tokens: List[int]) -> List[str]:
+        """
+        Slice tokens into overlapping windows and decode each window.
+
+        A multibyte character can span several byte-level tokens, so both window
+        edges are moved back to the nearest token that starts a character;
+        windows never cut a character in half and still cover all the text.
+        """
+        token_bytes = self._encoding.decode_tokens_bytes(tokens)
+        # starts[i]: token i begins a UTF-8 character (is not a continuation byte)
+        starts = [not piece or piece[0] & 0xC0 != 0x80 for piece in token_bytes]
+        starts.append(True)
+
+        def snap_back(i: int) -> int:
+            while i > 0 and not starts[i]:
+                i -= 1
+            return i
+
+        def snap_forward(i: int) -> int:
+            while not starts[i]:
+                i += 1
+            return i
+
+        chunks = []
+        stretched_end = 0
+        step = self.chunk_size - self.chunk_overlap
+        for start in range(0, len(tokens), step):
+            begin = max(snap_back(start), stretched_end)
+            if begin == len(tokens):
+                break
+            end = snap_back(min(start + self.chunk_size, len(tokens)))
+            if end <= begin:
+                # A single character longer than chunk_size: keep it whole
+                end = snap_forward(begin + 1)
+                stretched_end = end
+            chunk = b"".join(token_bytes[begin:end]).decode("utf-8", errors="replace")
+            if chunk.strip():
+                chunks.append(chunk.strip())
+            if start + self.chunk_size >= len(tokens):
+                break
+
+        return chunks
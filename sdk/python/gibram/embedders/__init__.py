@@ -2,5 +2,6 @@
 
 from .base import BaseEmbedder
 from .openai import OpenAIEmbedder
+from .cached import CachedEmbedder
 
-__all__ = ["BaseEmbedder", "OpenAIEmbedder"]
+__all__ = ["BaseEmbedder", "OpenAIEmbedder", "CachedEmbedder"]
@@ -1,34 +1,41 @@
 """Text embedder base interface."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence
 
 
 class BaseEmbedder(ABC):
     """Abstract base class for text embedders."""
 
     @abstractmethod
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> Sequence[Sequence[float]]:
         """
         Generate embeddings for batch of texts.
 
+        Callers should pass many texts per call: one request for N texts is
+        much cheaper than N single-text requests. Keep batches within the
+        provider's limit (e.g. 2048 inputs for OpenAI, 128 for Voyage).
+
         Args:
             texts: List of text strings
 
         Returns:
-            List of embedding vectors
+            Embedding vectors, one per text: a list of lists, or a 2-D
+            (len(texts), dimensions) array such as a float32 numpy.ndarray,
+            whose rows are sent to the server without conversion
         """
         pass
 
-    @abstractmethod
-    def embed_single(self, text: str) -> List[float]:
+    def embed_single(self, text: str) -> Sequence[float]:
         """
         Generate embedding for single text.
 
+        Prefer embed() with a list when there is more than one text.
+
         Args:
             text: Input text
 
         Returns:
             Embedding vector
         """
-        pass
+        return self.embed([text])[0]
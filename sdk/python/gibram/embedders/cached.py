@@ -0,0 +1,194 @@
+"""Caching wrapper for text embedders."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+from .base import BaseEmbedder
+
+
+class CachedEmbedder(BaseEmbedder):
+    """
+    Embedder wrapper that caches vectors by text hash.
+
+    Repeated texts (the same query asked again, boilerplate chunks) are served
+    from memory instead of calling the wrapped embedder. Only cache misses are
+    forwarded, in a single batch.
+
+    The cache can be persisted to a JSON file with save() and is loaded from
+    cache_path on construction, so it survives across runs. The file records
+    which embedder (class, model, dimensions) produced the vectors; a file
+    written by a different embedder is ignored on load.
+
+    Example:
+        >>> embedder = CachedEmbedder(OpenAIEmbedder(api_key="sk-..."))
+        >>> indexer = GibRAMIndexer(session_id="demo", embedder=embedder)
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        max_size: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        cache_path: Optional[str] = None,
+    ):
+        """
+        Initialize cached embedder.
+
+        Args:
+            embedder: Embedder used for cache misses
+            max_size: Maximum cached vectors (least recently used are evicted)
+            ttl_seconds: Entry lifetime in seconds (None = never expire)
+            cache_path: JSON file to load the cache from and save() it to
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+        self.embedder = embedder
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.cache_path = os.path.expanduser(cache_path) if cache_path else None
+
+        # key -> (created_at, vector), oldest first
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_path and os.path.exists(self.cache_path):
+            self._load(self.cache_path)
+
+    def _embedder_identity(self) -> Dict[str, Any]:
+        """Describe the wrapped embedder, so vectors from another model are never reused."""
+        embedder_type = type(self.embedder)
+        return {
+            "class": f"{embedder_type.__module__}.{embedder_type.__qualname__}",
+            "model": getattr(self.embedder, "model", None),
+            "dimensions": getattr(self.embedder, "dimensions", None),
+        }
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str, now: float):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        created_at, vector = entry
+        if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return vector
+
+    def _put(self, key: str, vector, now: float):
+        self._cache[key] = (now, vector)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def embed(self, texts: List[str]) -> Sequence[Sequence[float]]:
+        """
+        Generate embeddings for batch of texts, using cached vectors when possible.
+
+        Args:
+            texts: List of text strings
+
+        Returns:
+            List of embedding vectors
+        """
+        now = time.time()
+        keys = [self._key(text) for text in texts]
+        embeddings: List[Any] = [None] * len(texts)
+        misses: "OrderedDict[str, List[int]]" = OrderedDict()  # key -> positions in texts
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._get(key, now)
+                if vector is None:
+                    misses.setdefault(key, []).append(i)
+                else:
+                    embeddings[i] = vector
+
+        if misses:
+            vectors = self.embedder.embed([texts[positions[0]] for positions in misses.values()])
+
+            with self._lock:
+                for (key, positions), vector in zip(misses.items(), vectors):
+                    # A row of an ndarray is a view that keeps the whole batch alive
+                    vector = [float(x) for x in vector]
+                    self._put(key, vector, now)
+                    for i in positions:
+                        embeddings[i] = vector
+
+        return embeddings
+
+    def clear(self):
+        """Drop all cached vectors."""
+        with self._lock:
+            self._cache.clear()
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist the cache as JSON.
+
+        Args:
+            path: Output file (default: cache_path)
+
+        Raises:
+            ValueError: If neither path nor cache_path is set
+        """
+        path = os.path.expanduser(path) if path else self.cache_path
+        if not path:
+            raise ValueError("No cache path given")
+
+        with self._lock:
+            entries = {
+                key: [created_at, vector] for key, (created_at, vector) in self._cache.items()
+            }
+        data = {"embedder": self._embedder_identity(), "entries": entries}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write atomically so an interrupted save never leaves a truncated cache
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _load(self, path: str):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A missing or corrupt cache file just means a cold cache
+            return
+
+        # Vectors from a different embedder/model/dimensions (or an unversioned
+        # file) would be the wrong size or space, so start cold instead
+        if not isinstance(data, dict) or data.get("embedder") != self._embedder_identity():
+            return
+
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return
+
+        # Validate every entry before caching any, so a malformed file loads nothing
+        now = time.time()
+        loaded = []
+        try:
+            for key, (created_at, vector) in entries.items():
+                created_at = float(created_at)
+                if self.ttl_seconds is None or now - created_at <= self.ttl_seconds:
+                    loaded.append((key, [float(x) for x in vector], created_at))
+        except (TypeError, ValueError):
+            return
+
+        for key, vector, created_at in loaded:
+            self._put(key, vector, created_at)
@@ -1,26 +1,44 @@
 """GibRAM Indexer - GraphRAG-style knowledge graph indexing."""
 
+import asyncio
 import os
+import random
 import time
 import uuid
-from typing import List, Union, Dict, Any, Optional, Literal
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    AsyncIterator,
+    List,
+    Tuple,
+    Union,
+    Dict,
+    Any,
+    Optional,
+    Literal,
+    Sequence,
+    overload,
+)
 from tqdm import tqdm
 
 from ._client import _Client
 from .types import (
     IndexStats,
     QueryResult,
-    ScoredEntity,
-    ScoredTextUnit,
-    ScoredCommunity,
+    QueryCountResult,
     ExtractedEntity,
     ExtractedRelationship,
 )
 from .exceptions import ConfigurationError, GibRAMError
-from .chunkers import BaseChunker, TokenChunker
+from .chunkers import BaseChunker, TokenChunker, TiktokenChunker
 from .extractors import BaseExtractor, OpenAIExtractor
 from .embedders import BaseEmbedder, OpenAIEmbedder
 
+# Upper bound for the random delay staggering concurrent embedding batches
+_BATCH_JITTER_SECONDS = 0.05
+
+# Marks the end of input on index_stream() stage queues
+_END_OF_STREAM = object()
+
 
 class GibRAMIndexer:
     """
@@ -56,6 +74,7 @@ class GibRAMIndexer:
         # Chunking Configuration
         chunk_size: int = 512,
         chunk_overlap: int = 50,
+        tokenizer: Optional[str] = None,
         # Community Detection
         auto_detect_communities: bool = True,
         community_resolution: float = 1.0,
@@ -83,6 +102,8 @@ class GibRAMIndexer:
             
             chunk_size: Max tokens per chunk
             chunk_overlap: Overlap tokens between chunks
+            tokenizer: tiktoken encoding for chunking (e.g. "cl100k_base");
+                default approximates tokens by whitespace
             
             auto_detect_communities: Auto-run community detection after indexing
             community_resolution: Leiden resolution parameter (higher = more granular)
@@ -109,6 +130,10 @@ class GibRAMIndexer:
         # Initialize chunker
         if chunker:
             self._chunker = chunker
+        elif tokenizer:
+            self._chunker = TiktokenChunker(
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap, encoding_name=tokenizer
+            )
         else:
             self._chunker = TokenChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
@@ -162,6 +187,8 @@ class GibRAMIndexer:
         documents: Union[List[str], List[Dict[str, Any]]],
         batch_size: int = 10,
         show_progress: bool = True,
+        max_concurrent_batches: int = 1,
+        dedupe: bool = True,
     ) -> IndexStats:
         """
         Index documents into knowledge graph.
@@ -178,10 +205,16 @@ class GibRAMIndexer:
             documents: List of strings or dicts with {"id": ..., "text": ..., "metadata": ...}
             batch_size: Batch size for LLM calls & embeddings
             show_progress: Show tqdm progress bar
+            max_concurrent_batches: Embedding batches in flight at once
+                (1 = sequential; raise when API round-trips dominate)
+            dedupe: Embed identical chunk/entity texts once and reuse the vector
 
         Returns:
             IndexStats with counts
 
+        Raises:
+            ValueError: If max_concurrent_batches is less than 1
+
         Examples:
             >>> stats = indexer.index_documents([
             ...     "Einstein was born in 1879.",
@@ -189,29 +222,13 @@ class GibRAMIndexer:
             ... ])
             >>> print(f"Indexed {stats.entities_extracted} entities")
         """
+        if max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+
         start_time = time.time()
         stats = IndexStats()
 
-        # Normalize documents to dict format
-        normalized_docs = []
-        for doc in documents:
-            if isinstance(doc, str):
-                normalized_docs.append({
-                    "id": str(uuid.uuid4()),
-                    "text": doc,
-                    "metadata": {},
-                })
-            elif isinstance(doc, dict):
-                if "text" not in doc:
-                    raise ValueError("Document dict must have 'text' key")
-                normalized_docs.append({
-                    "id": doc.get("id", str(uuid.uuid4())),
-                    "text": doc["text"],
-                    "metadata": doc.get("metadata", {}),
-                })
-            else:
-                raise ValueError("Documents must be strings or dicts")
-
+        normalized_docs = self._normalize_documents(documents)
         stats.documents_indexed = len(normalized_docs)
 
         # Connect to server
@@ -223,12 +240,15 @@ class GibRAMIndexer:
         all_relationships = []
         entity_title_to_ids = {}  # Map entity titles to their IDs
 
-        for doc in tqdm(normalized_docs, desc="Processing documents", disable=not show_progress):
+        # Chunk all documents up front so batch-capable chunkers can parallelize
+        doc_chunks = self._chunker.chunk_batch([doc["text"] for doc in normalized_docs])
+
+        for doc, chunks in zip(
+            tqdm(normalized_docs, desc="Processing documents", disable=not show_progress),
+            doc_chunks,
+        ):
             # Add document to server
             doc_id = self._client.add_document(external_id=doc["id"], filename=doc["id"])
-
-            # Chunk text
-            chunks = self._chunker.chunk(doc["text"])
             stats.text_units_created += len(chunks)
 
             # Process chunks in batches for extraction
@@ -267,12 +287,9 @@ class GibRAMIndexer:
 
         # Chunk embeddings
         chunk_texts = [c["text"] for c in all_chunks]
-        chunk_embeddings = []
-        if chunk_texts:
-            for i in range(0, len(chunk_texts), batch_size):
-                batch = chunk_texts[i : i + batch_size]
-                embeddings = self._embedder.embed(batch)
-                chunk_embeddings.extend(embeddings)
+        chunk_embeddings = self._embed_texts(
+            chunk_texts, batch_size, max_concurrent_batches, dedupe
+        )
 
         # Entity embeddings (deduplicate by title)
         unique_entities = {}
@@ -281,18 +298,287 @@ class GibRAMIndexer:
                 unique_entities[entity.title] = entity
 
         entity_texts = [f"{e.title}: {e.description}" for e in unique_entities.values()]
-        entity_embeddings = []
-        if entity_texts:
-            for i in range(0, len(entity_texts), batch_size):
-                batch = entity_texts[i : i + batch_size]
-                embeddings = self._embedder.embed(batch)
-                entity_embeddings.extend(embeddings)
+        entity_embeddings = self._embed_texts(
+            entity_texts, batch_size, max_concurrent_batches, dedupe
+        )
 
         # Store entities in graph
         if show_progress:
             print("Storing entities...")
 
-        for entity, embedding in zip(unique_entities.values(), entity_embeddings):
+        self._store_entities(
+            list(unique_entities.values()),
+            entity_embeddings,
+            entity_title_to_ids,
+            stats,
+            show_progress,
+        )
+
+        # Store text units in graph and link to entities
+        if show_progress:
+            print("Storing text units...")
+
+        self._store_text_units(all_chunks, chunk_embeddings, entity_title_to_ids, show_progress)
+
+        # Store relationships
+        if show_progress:
+            print("Storing relationships...")
+
+        self._store_relationships(all_relationships, entity_title_to_ids, stats, show_progress)
+
+        # Detect communities
+        if self.auto_detect_communities and stats.entities_extracted > 0:
+            if show_progress:
+                print("Detecting communities...")
+
+            try:
+                community_count = self._client.compute_communities(self.community_resolution)
+                stats.communities_detected = community_count
+            except Exception as e:
+                if show_progress:
+                    tqdm.write(f"Warning: Community detection failed: {e}")
+
+        stats.indexing_time_seconds = time.time() - start_time
+        self._stats = stats
+        return stats
+
+    async def index_stream(
+        self,
+        documents: Union[List[str], List[Dict[str, Any]]],
+        batch_size: int = 10,
+        show_progress: bool = True,
+        max_concurrent_batches: int = 1,
+        dedupe: bool = True,
+        queue_size: int = 2,
+    ) -> AsyncIterator[IndexStats]:
+        """
+        Index documents as an overlapping pipeline, yielding stats per document.
+
+        Pipeline (stages run concurrently, connected by bounded queues):
+            1. Chunk & extract entities/relationships (LLM)
+            2. Generate embeddings for chunks and newly seen entities
+            3. Store document, entities, text units and relationships
+
+        While document K is being stored, document K+1 is embedded and
+        document K+2 extracted. Blocking calls run in the default executor;
+        only the storage stage talks to the server.
+
+        Args:
+            documents: List of strings or dicts with {"id": ..., "text": ..., "metadata": ...}
+            batch_size: Batch size for embeddings
+            show_progress: Show tqdm progress bar and warnings for skipped items
+            max_concurrent_batches: Embedding batches in flight at once
+            dedupe: Embed identical chunk/entity texts once and reuse the vector
+            queue_size: Documents buffered between stages (bounds memory)
+
+        Yields:
+            IndexStats for each document. Relationships whose entities first
+            appear in a later document are stored after the last document; they
+            and communities_detected are reported in one final IndexStats.
+            get_stats() returns the running totals, including when the stream
+            is stopped early or fails.
+
+        Raises:
+            ValueError: If max_concurrent_batches or queue_size is less than 1
+
+        Examples:
+            >>> async for stats in indexer.index_stream(documents):
+            ...     print(f"{stats.entities_extracted} entities")
+        """
+        if max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        normalized_docs = self._normalize_documents(documents)
+
+        extracted: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        embedded: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        async def extract_stage():
+            try:
+                for doc in normalized_docs:
+                    chunk_count, chunks = await loop.run_in_executor(
+                        None, self._extract_chunks, doc["text"], show_progress
+                    )
+                    await extracted.put((doc, chunk_count, chunks))
+            finally:
+                await extracted.put(_END_OF_STREAM)
+
+        async def embed_stage():
+            seen_titles = set()
+            try:
+                while True:
+                    item = await extracted.get()
+                    if item is _END_OF_STREAM:
+                        break
+                    doc, chunk_count, chunks = item
+
+                    # Entities are embedded once, by the first document mentioning them
+                    new_entities = {}
+                    for chunk in chunks:
+                        for entity in chunk["entities"]:
+                            if entity.title not in seen_titles:
+                                new_entities.setdefault(entity.title, entity)
+                    seen_titles.update(new_entities)
+
+                    texts = [c["text"] for c in chunks]
+                    texts += [f"{e.title}: {e.description}" for e in new_entities.values()]
+                    embeddings = await loop.run_in_executor(
+                        None,
+                        self._embed_texts,
+                        texts,
+                        batch_size,
+                        max_concurrent_batches,
+                        dedupe,
+                    )
+                    await embedded.put(
+                        (
+                            doc,
+                            chunk_count,
+                            chunks,
+                            embeddings[: len(chunks)],
+                            list(new_entities.values()),
+                            embeddings[len(chunks) :],
+                        )
+                    )
+            finally:
+                await embedded.put(_END_OF_STREAM)
+
+        def store(doc, chunk_count, chunks, chunk_embeddings, entities, entity_embeddings):
+            stats = IndexStats(documents_indexed=1, text_units_created=chunk_count)
+            doc_id = self._client.add_document(external_id=doc["id"], filename=doc["id"])
+            for chunk in chunks:
+                chunk["doc_id"] = doc_id
+
+            self._store_entities(
+                entities, entity_embeddings, entity_title_to_ids, stats, show_progress
+            )
+            self._store_text_units(chunks, chunk_embeddings, entity_title_to_ids, show_progress)
+            relationships = [r for c in chunks for r in c["relationships"]]
+            pending_relationships.extend(
+                self._store_relationships(relationships, entity_title_to_ids, stats, show_progress)
+            )
+            return stats
+
+        # Updated in place, so get_stats() reflects progress even if the
+        # consumer stops iterating before the stream is exhausted
+        totals = IndexStats()
+        self._stats = totals
+        entity_title_to_ids: Dict[str, int] = {}
+        pending_relationships: List[ExtractedRelationship] = []
+        progress = tqdm(
+            total=len(normalized_docs), desc="Indexing documents", disable=not show_progress
+        )
+
+        await loop.run_in_executor(None, self._client.connect)
+        tasks = [asyncio.ensure_future(extract_stage()), asyncio.ensure_future(embed_stage())]
+        try:
+            while True:
+                item = await embedded.get()
+                if item is _END_OF_STREAM:
+                    break
+
+                stats = await loop.run_in_executor(None, store, *item)
+                totals.documents_indexed += stats.documents_indexed
+                totals.text_units_created += stats.text_units_created
+                totals.entities_extracted += stats.entities_extracted
+                totals.relationships_extracted += stats.relationships_extracted
+                progress.update(1)
+                yield stats
+
+            # Surface any stage failure
+            await asyncio.gather(*tasks)
+
+            final = IndexStats()
+            if pending_relationships:
+                await loop.run_in_executor(
+                    None,
+                    self._store_relationships,
+                    pending_relationships,
+                    entity_title_to_ids,
+                    final,
+                    show_progress,
+                )
+
+            if self.auto_detect_communities and totals.entities_extracted > 0:
+                try:
+                    final.communities_detected = await loop.run_in_executor(
+                        None, self._client.compute_communities, self.community_resolution
+                    )
+                except Exception as e:
+                    if show_progress:
+                        tqdm.write(f"Warning: Community detection failed: {e}")
+
+            totals.relationships_extracted += final.relationships_extracted
+            totals.communities_detected = final.communities_detected
+            if final.relationships_extracted or final.communities_detected:
+                yield final
+        finally:
+            for task in tasks:
+                task.cancel()
+            progress.close()
+            totals.indexing_time_seconds = time.time() - start_time
+
+    def _extract_chunks(self, text: str, show_progress: bool) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Chunk text and extract entities & relationships per chunk.
+
+        Chunks whose extraction fails are skipped (with a warning if show_progress).
+
+        Returns:
+            Tuple of (chunk count, extracted chunk dicts)
+        """
+        chunks = self._chunker.chunk(text)
+        extracted = []
+        for chunk in chunks:
+            try:
+                entities, relationships = self._extractor.extract(chunk)
+            except Exception as e:
+                # Log error but continue (don't fail entire indexing)
+                if show_progress:
+                    tqdm.write(f"Warning: Extraction failed for chunk: {e}")
+                continue
+            extracted.append({"text": chunk, "entities": entities, "relationships": relationships})
+        return len(chunks), extracted
+
+    def _normalize_documents(
+        self, documents: Union[List[str], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Normalize documents to {"id", "text", "metadata"} dicts."""
+        normalized_docs = []
+        for doc in documents:
+            if isinstance(doc, str):
+                normalized_docs.append({
+                    "id": str(uuid.uuid4()),
+                    "text": doc,
+                    "metadata": {},
+                })
+            elif isinstance(doc, dict):
+                if "text" not in doc:
+                    raise ValueError("Document dict must have 'text' key")
+                normalized_docs.append({
+                    "id": doc.get("id", str(uuid.uuid4())),
+                    "text": doc["text"],
+                    "metadata": doc.get("metadata", {}),
+                })
+            else:
+                raise ValueError("Documents must be strings or dicts")
+
+        return normalized_docs
+
+    def _store_entities(
+        self,
+        entities: List[ExtractedEntity],
+        embeddings: Sequence[Sequence[float]],
+        entity_title_to_ids: Dict[str, int],
+        stats: IndexStats,
+        show_progress: bool,
+    ):
+        """Store entities, recording their server IDs by title."""
+        for entity, embedding in zip(entities, embeddings):
             try:
                 entity_id = self._client.add_entity(
                     external_id=f"entity-{uuid.uuid4()}",
@@ -307,11 +593,15 @@ class GibRAMIndexer:
                 if show_progress:
                     tqdm.write(f"Warning: Failed to store entity '{entity.title}': {e}")
 
-        # Store text units in graph and link to entities
-        if show_progress:
-            print("Storing text units...")
-
-        for chunk_data, embedding in zip(all_chunks, chunk_embeddings):
+    def _store_text_units(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: Sequence[Sequence[float]],
+        entity_title_to_ids: Dict[str, int],
+        show_progress: bool,
+    ):
+        """Store text units and link them to the stored entities they mention."""
+        for chunk_data, embedding in zip(chunks, embeddings):
             try:
                 textunit_id = self._client.add_text_unit(
                     external_id=f"tu-{uuid.uuid4()}",
@@ -335,11 +625,22 @@ class GibRAMIndexer:
                 if show_progress:
                     tqdm.write(f"Warning: Failed to store text unit: {e}")
 
-        # Store relationships
-        if show_progress:
-            print("Storing relationships...")
+    def _store_relationships(
+        self,
+        relationships: List[ExtractedRelationship],
+        entity_title_to_ids: Dict[str, int],
+        stats: IndexStats,
+        show_progress: bool,
+    ) -> List[ExtractedRelationship]:
+        """
+        Store relationships whose source and target entities are stored.
+
+        Returns:
+            Relationships skipped because an endpoint entity is not stored
+        """
+        unresolved = []
 
-        for relationship in all_relationships:
+        for relationship in relationships:
             # Check if both source and target entities exist
             source_id = entity_title_to_ids.get(relationship.source_title)
             target_id = entity_title_to_ids.get(relationship.target_title)
@@ -358,22 +659,105 @@ class GibRAMIndexer:
                 except Exception as e:
                     if show_progress:
                         tqdm.write(f"Warning: Failed to store relationship: {e}")
+            else:
+                unresolved.append(relationship)
 
-        # Detect communities
-        if self.auto_detect_communities and stats.entities_extracted > 0:
-            if show_progress:
-                print("Detecting communities...")
+        return unresolved
 
-            try:
-                community_count = self._client.compute_communities(self.community_resolution)
-                stats.communities_detected = community_count
-            except Exception as e:
-                if show_progress:
-                    tqdm.write(f"Warning: Community detection failed: {e}")
+    def _embed_texts(
+        self,
+        texts: List[str],
+        batch_size: int,
+        max_concurrent_batches: int,
+        dedupe: bool,
+    ) -> List[Sequence[float]]:
+        """
+        Embed texts, optionally sending each distinct text only once.
 
-        stats.indexing_time_seconds = time.time() - start_time
-        self._stats = stats
-        return stats
+        With dedupe, duplicates (boilerplate, repeated headers) are embedded
+        once and the vector is reused for every occurrence.
+        """
+        if not dedupe:
+            return self._embed_batched(texts, batch_size, max_concurrent_batches)
+
+        # Map each distinct text to its position in unique_texts
+        slots: Dict[str, int] = {}
+        for text in texts:
+            slots.setdefault(text, len(slots))
+
+        if len(slots) == len(texts):
+            return self._embed_batched(texts, batch_size, max_concurrent_batches)
+
+        unique_texts = list(slots)
+        unique_embeddings = self._embed_batched(unique_texts, batch_size, max_concurrent_batches)
+        return [unique_embeddings[slots[text]] for text in texts]
+
+    def _embed_batched(
+        self, texts: List[str], batch_size: int, max_concurrent_batches: int
+    ) -> List[Sequence[float]]:
+        """
+        Embed texts in batches of batch_size, keeping input order.
+
+        With max_concurrent_batches > 1, batches are dispatched from a bounded
+        thread pool so embedding API round-trips overlap.
+        """
+        starts = range(0, len(texts), batch_size)
+        embeddings: List[Sequence[float]] = []
+
+        if max_concurrent_batches == 1 or len(starts) <= 1:
+            for start in starts:
+                embeddings.extend(self._embedder.embed(texts[start : start + batch_size]))
+            return embeddings
+
+        def embed_batch(start: int) -> Sequence[Sequence[float]]:
+            # Stagger requests so a burst of batches doesn't trip rate limits
+            time.sleep(random.uniform(0, _BATCH_JITTER_SECONDS))
+            return self._embedder.embed(texts[start : start + batch_size])
+
+        workers = min(max_concurrent_batches, len(starts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in submission order
+            for batch_embeddings in executor.map(embed_batch, starts):
+                embeddings.extend(batch_embeddings)
+
+        return embeddings
+
+    @overload
+    def query(
+        self,
+        query: str,
+        mode: Literal["local", "global", "hybrid"] = ...,
+        top_k: int = ...,
+        include_entities: bool = ...,
+        include_text_units: bool = ...,
+        include_communities: bool = ...,
+        count_only: Literal[False] = ...,
+    ) -> QueryResult: ...
+
+    @overload
+    def query(
+        self,
+        query: str,
+        mode: Literal["local", "global", "hybrid"] = ...,
+        top_k: int = ...,
+        include_entities: bool = ...,
+        include_text_units: bool = ...,
+        include_communities: bool = ...,
+        *,
+        count_only: Literal[True],
+    ) -> QueryCountResult: ...
+
+    @overload
+    def query(
+        self,
+        query: str,
+        mode: Literal["local", "global", "hybrid"] = ...,
+        top_k: int = ...,
+        include_entities: bool = ...,
+        include_text_units: bool = ...,
+        include_communities: bool = ...,
+        count_only: bool = ...,
+    ) -> Union[QueryResult, QueryCountResult]: ...
 
     def query(
         self,
@@ -383,7 +767,8 @@ class GibRAMIndexer:
         include_entities: bool = True,
         include_text_units: bool = True,
         include_communities: bool = False,
-    ) -> QueryResult:
+        count_only: bool = False,
+    ) -> Union[QueryResult, QueryCountResult]:
         """
         Query knowledge graph.
 
@@ -394,9 +779,11 @@ class GibRAMIndexer:
             include_entities: Include entity results
             include_text_units: Include text unit results
             include_communities: Include community results
+            count_only: Return only result counts, skipping result decoding
 
         Returns:
-            QueryResult with entities, text_units, communities
+            QueryResult with entities, text_units, communities, or
+            QueryCountResult if count_only
 
         Examples:
             >>> result = indexer.query("Einstein's theories", top_k=5)
@@ -407,7 +794,7 @@ class GibRAMIndexer:
             raise NotImplementedError("Only 'local' mode is supported currently")
 
         # Generate query embedding
-        query_embedding = self._embedder.embed_single(query)
+        query_embedding = self._embedder.embed([query])[0]
 
         # Determine search types
         search_types = []
@@ -419,50 +806,13 @@ class GibRAMIndexer:
             search_types.append("community")
 
         if not search_types:
-            return QueryResult()
-
-        # Execute query
-        raw_result = self._client.query(query_embedding, search_types, top_k)
-
-        # Parse results
-        entities = [
-            ScoredEntity(
-                id=e["entity"]["id"],
-                title=e["entity"]["title"],
-                type=e["entity"]["type"],
-                description=e["entity"]["description"],
-                score=e["similarity"],
-            )
-            for e in raw_result.get("entities", [])
-        ]
-
-        text_units = [
-            ScoredTextUnit(
-                id=tu["textunit"]["id"],
-                content=tu["textunit"]["content"],
-                document_id=tu["textunit"]["document_id"],
-                score=tu["similarity"],
-            )
-            for tu in raw_result.get("textunits", [])
-        ]
-
-        communities = [
-            ScoredCommunity(
-                id=c["community"]["id"],
-                title=c["community"]["title"],
-                summary=c["community"]["summary"],
-                entity_count=len(c["community"]["entity_ids"]),
-                score=c["similarity"],
-            )
-            for c in raw_result.get("communities", [])
-        ]
-
-        return QueryResult(
-            entities=entities,
-            text_units=text_units,
-            communities=communities,
-            execution_time_ms=raw_result.get("execution_time_ms", 0.0),
-        )
+            return QueryCountResult() if count_only else QueryResult()
+
+        if count_only:
+            counts = self._client.query_counts(query_embedding, search_types, top_k)
+            return QueryCountResult(**counts)
+
+        return self._client.query(query_embedding, search_types, top_k)
 
     def get_stats(self) -> IndexStats:
         """Get current index statistics."""
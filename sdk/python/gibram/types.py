@@ -76,3 +76,13 @@ class QueryResult:
     text_units: List[ScoredTextUnit] = field(default_factory=list)
     communities: List[ScoredCommunity] = field(default_factory=list)
     execution_time_ms: float = 0.0
+
+
+@dataclass
+class QueryCountResult:
+    """Query result counts (from query(count_only=True))."""
+
+    entity_count: int = 0
+    text_unit_count: int = 0
+    community_count: int = 0
+    execution_time_ms: float = 0.0
@@ -7,9 +7,31 @@ Usage:
     python quick_test.py
 """
 
+import asyncio
 import os
 import sys
 
+# Import up front so SDK import cost stays out of the indexing/query timings
+try:
+    from gibram import GibRAMIndexer
+    from tqdm import tqdm
+except ImportError as e:
+    print(f"❌ Failed to import GibRAM SDK: {e}")
+    print("\nInstall SDK:")
+    print("  cd sdk/python && pip install -e .")
+    sys.exit(1)
+
+
+async def index_streaming(indexer, documents):
+    """Index documents, reporting progress as each one is stored."""
+    async for stats in indexer.index_stream(
+        documents, batch_size=2, show_progress=True, max_concurrent_batches=5
+    ):
+        if stats.documents_indexed:
+            tqdm.write(f"   Stored document: {stats.entities_extracted} new entities")
+    return indexer.get_stats()
+
+
 def main():
     print("=" * 60)
     print("GibRAM Python SDK v0.2.0 - Quick Test")
@@ -27,15 +49,7 @@ def main():
 
     print(f"✅ OpenAI API key found: {api_key[:10]}...\n")
 
-    # Import SDK
-    try:
-        from gibram import GibRAMIndexer
-        print("✅ GibRAM SDK imported\n")
-    except ImportError as e:
-        print(f"❌ Failed to import GibRAM SDK: {e}")
-        print("\nInstall SDK:")
-        print("  cd sdk/python && pip install -e .")
-        sys.exit(1)
+    print("✅ GibRAM SDK imported\n")
 
     # Test indexing
     print("Testing indexing with OpenAI GPT-4...")
@@ -53,7 +67,7 @@ def main():
             auto_detect_communities=True,
         ) as indexer:
             print(f"\n📄 Indexing {len(documents)} documents...")
-            stats = indexer.index_documents(documents, batch_size=2, show_progress=True)
+            stats = asyncio.run(index_streaming(indexer, documents))
 
             print("\n" + "=" * 60)
             print("Results:")
@@ -1,16 +1,60 @@
-"""Integration test for GibRAM Python SDK v0.2.0."""
+"""Integration test for GibRAM Python SDK v0.2.0.
 
+Requires a running GibRAM server on localhost:6161 and OPENAI_API_KEY.
+
+Usage:
+    pytest -v test_integration.py
+
+Tests are independent and I/O-bound, so they can run in parallel with
+pytest-xdist (pip install -e ".[dev]"):
+    pytest -n auto test_integration.py
+"""
+
+import asyncio
 import os
+import socket
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gibram import GibRAMIndexer, ConfigurationError
+from gibram.extractors import BaseExtractor
+from gibram.types import ExtractedEntity, ExtractedRelationship
+
+
+class ScriptedExtractor(BaseExtractor):
+    """Extractor returning fixed results per chunk, for deterministic graph shapes."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def extract(self, text):
+        return self.results.get(text, ([], []))
+
+
+def _server_reachable(host, port):
+    """Return True if a TCP connection to host:port succeeds."""
+    try:
+        socket.create_connection((host, port), timeout=0.5).close()
+        return True
+    except OSError:
+        return False
 
 
 def check_environment():
     """Check prerequisites before running tests."""
     print("=== Environment Check ===\n")
 
+    # Probe the server while reading the API key
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_key_future = executor.submit(os.getenv, "OPENAI_API_KEY")
+        server_future = executor.submit(_server_reachable, "localhost", 6161)
+        api_key = api_key_future.result()
+        server_ok = server_future.result()
+
     # Check OpenAI API key
-    api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("❌ OPENAI_API_KEY not set")
         print("   Export your API key: export OPENAI_API_KEY='sk-...'")
@@ -19,268 +63,164 @@ def check_environment():
         print(f"✅ OpenAI API key found: {api_key[:10]}...")
 
     # Check server connection
-    print("\nChecking GibRAM server connection...")
-    try:
-        import socket
-
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex(("localhost", 6161))
-        sock.close()
-
-        if result == 0:
-            print("✅ GibRAM server is running on localhost:6161")
-        else:
-            print("❌ GibRAM server not accessible on localhost:6161")
-            print("   Start server: docker run -d -p 6161:6161 gibram:latest")
-            return False
-    except Exception as e:
-        print(f"❌ Connection check failed: {e}")
+    if server_ok:
+        print("✅ GibRAM server is running on localhost:6161")
+    else:
+        print("❌ GibRAM server not accessible on localhost:6161")
+        print("   Start server: docker run -d -p 6161:6161 gibram:latest")
         return False
 
     return True
 
 
-def test_basic_workflow():
-    """Test basic indexing and querying workflow."""
-    print("\n=== Test 1: Basic Workflow ===\n")
-
-    try:
-        from gibram import GibRAMIndexer
-
-        # Initialize indexer
-        print("1. Initializing indexer...")
-        indexer = GibRAMIndexer(
-            session_id=f"test-{int(time.time())}",
-            chunk_size=256,
-            auto_detect_communities=True,
-        )
-        print("   ✅ Indexer initialized")
-
-        # Test documents
-        documents = [
-            "Python is a high-level programming language created by Guido van Rossum in 1991.",
-            "JavaScript was created by Brendan Eich in 1995 at Netscape.",
-            "Rust is a systems programming language focused on safety and performance.",
-        ]
-
-        # Index documents
-        print("\n2. Indexing documents...")
-        stats = indexer.index_documents(documents, batch_size=3, show_progress=False)
-
-        print(f"   ✅ Indexed {stats.documents_indexed} documents")
-        print(f"   - Text units created: {stats.text_units_created}")
-        print(f"   - Entities extracted: {stats.entities_extracted}")
-        print(f"   - Relationships extracted: {stats.relationships_extracted}")
-        print(f"   - Communities detected: {stats.communities_detected}")
-        print(f"   - Indexing time: {stats.indexing_time_seconds:.2f}s")
-
-        # Validate counts
-        assert stats.documents_indexed == 3, "Should index 3 documents"
-        assert stats.text_units_created > 0, "Should create text units"
-        assert stats.entities_extracted > 0, "Should extract entities"
-        print("   ✅ Stats validation passed")
-
-        # Query
-        print("\n3. Querying knowledge graph...")
-        result = indexer.query("programming languages", top_k=5)
-
-        print(f"   ✅ Query executed in {result.execution_time_ms:.2f}ms")
-        print(f"   - Entities found: {len(result.entities)}")
-        print(f"   - Text units found: {len(result.text_units)}")
-
-        # Display top results
-        if result.entities:
-            print("\n   Top entities:")
-            for entity in result.entities[:3]:
-                print(f"     - {entity.title} ({entity.type}): score={entity.score:.3f}")
-
-        # Validate results
-        assert len(result.entities) > 0 or len(result.text_units) > 0, "Should return results"
-        print("   ✅ Query validation passed")
-
-        # Cleanup
-        indexer.close()
-        print("\n✅ Test 1 PASSED\n")
-        return True
-
-    except Exception as e:
-        print(f"\n❌ Test 1 FAILED: {e}")
-        import traceback
-
-        traceback.print_exc()
-        return False
-
-
-def test_context_manager():
-    """Test context manager usage."""
-    print("\n=== Test 2: Context Manager ===\n")
-
-    try:
-        from gibram import GibRAMIndexer
-
-        session_id = f"test-cm-{int(time.time())}"
-
-        print("Testing context manager...")
-        with GibRAMIndexer(session_id=session_id, chunk_size=128) as indexer:
-            stats = indexer.index_documents(
-                ["Test document for context manager."], show_progress=False
-            )
-            assert stats.documents_indexed == 1
-            print("   ✅ Indexing inside context manager works")
-
-        print("   ✅ Context manager cleanup successful")
-        print("\n✅ Test 2 PASSED\n")
-        return True
-
-    except Exception as e:
-        print(f"\n❌ Test 2 FAILED: {e}")
-        import traceback
+@pytest.fixture(scope="session")
+def environment():
+    """Skip tests that need the server and OpenAI when prerequisites are missing."""
+    if not check_environment():
+        pytest.skip("GibRAM server or OPENAI_API_KEY not available")
 
-        traceback.print_exc()
-        return False
 
+@pytest.fixture(scope="module")
+def indexer(environment):
+    """
+    Shared indexer for tests that only index and query.
 
-def test_error_handling():
-    """Test error handling."""
-    print("\n=== Test 3: Error Handling ===\n")
+    One connection is opened per module (per worker under xdist) instead of
+    per test; the pid keeps xdist workers on separate sessions.
+    """
+    with GibRAMIndexer(
+        session_id=f"test-{int(time.time())}-{os.getpid()}",
+        chunk_size=256,
+        auto_detect_communities=True,
+    ) as shared:
+        yield shared
 
-    try:
-        from gibram import GibRAMIndexer, ConfigurationError
-
-        # Test missing session_id
-        print("1. Testing missing session_id...")
-        try:
-            indexer = GibRAMIndexer(session_id="")
-            print("   ❌ Should have raised ConfigurationError")
-            return False
-        except ConfigurationError:
-            print("   ✅ ConfigurationError raised correctly")
-
-        # Test missing API key
-        print("\n2. Testing missing API key...")
-        old_key = os.getenv("OPENAI_API_KEY")
-        os.environ.pop("OPENAI_API_KEY", None)
-
-        try:
-            indexer = GibRAMIndexer(session_id="test-error")
-            print("   ❌ Should have raised ConfigurationError")
-            return False
-        except ConfigurationError as e:
-            print(f"   ✅ ConfigurationError raised: {e}")
-        finally:
-            if old_key:
-                os.environ["OPENAI_API_KEY"] = old_key
-
-        print("\n✅ Test 3 PASSED\n")
-        return True
-
-    except Exception as e:
-        print(f"\n❌ Test 3 FAILED: {e}")
-        import traceback
 
-        traceback.print_exc()
-        return False
+def test_basic_workflow(indexer):
+    """Test basic indexing and querying workflow."""
+    documents = [
+        "Python is a high-level programming language created by Guido van Rossum in 1991.",
+        "JavaScript was created by Brendan Eich in 1995 at Netscape.",
+        "Rust is a systems programming language focused on safety and performance.",
+    ]
 
+    stats = indexer.index_documents(
+        documents, batch_size=3, show_progress=False, max_concurrent_batches=5
+    )
 
-def test_query_modes():
-    """Test different query modes and options."""
-    print("\n=== Test 4: Query Modes ===\n")
+    print(f"Indexed {stats.documents_indexed} documents")
+    print(f"  - Text units created: {stats.text_units_created}")
+    print(f"  - Entities extracted: {stats.entities_extracted}")
+    print(f"  - Relationships extracted: {stats.relationships_extracted}")
+    print(f"  - Communities detected: {stats.communities_detected}")
+    print(f"  - Indexing time: {stats.indexing_time_seconds:.2f}s")
 
-    try:
-        from gibram import GibRAMIndexer
-
-        session_id = f"test-query-{int(time.time())}"
-
-        with GibRAMIndexer(session_id=session_id, chunk_size=200) as indexer:
-            # Index test data
-            indexer.index_documents(
-                ["Machine learning is a subset of artificial intelligence."],
-                show_progress=False,
-            )
-
-            # Test entity-only query
-            print("1. Testing entity-only query...")
-            result = indexer.query(
-                "machine learning",
-                include_entities=True,
-                include_text_units=False,
-                include_communities=False,
-            )
-            assert len(result.text_units) == 0, "Should not return text units"
-            print("   ✅ Entity-only query works")
-
-            # Test text-unit-only query
-            print("\n2. Testing text-unit-only query...")
-            result = indexer.query(
-                "artificial intelligence",
-                include_entities=False,
-                include_text_units=True,
-                include_communities=False,
-            )
-            assert len(result.entities) == 0, "Should not return entities"
-            print("   ✅ Text-unit-only query works")
-
-        print("\n✅ Test 4 PASSED\n")
-        return True
+    assert stats.documents_indexed == 3, "Should index 3 documents"
+    assert stats.text_units_created > 0, "Should create text units"
+    assert stats.entities_extracted > 0, "Should extract entities"
 
-    except Exception as e:
-        print(f"\n❌ Test 4 FAILED: {e}")
-        import traceback
+    result = indexer.query("programming languages", top_k=5)
 
-        traceback.print_exc()
-        return False
+    print(f"Query executed in {result.execution_time_ms:.2f}ms")
+    for entity in result.entities[:3]:
+        print(f"  - {entity.title} ({entity.type}): score={entity.score:.3f}")
 
+    assert len(result.entities) > 0 or len(result.text_units) > 0, "Should return results"
 
-def main():
-    """Run all integration tests."""
-    print("=" * 60)
-    print("GibRAM Python SDK v0.2.0 Integration Tests")
-    print("=" * 60 + "\n")
 
-    # Check environment
-    if not check_environment():
-        print("\n❌ Environment check failed. Fix issues and try again.")
-        sys.exit(1)
-
-    # Run tests
-    tests = [
-        ("Basic Workflow", test_basic_workflow),
-        ("Context Manager", test_context_manager),
-        ("Error Handling", test_error_handling),
-        ("Query Modes", test_query_modes),
-    ]
+def test_context_manager(environment):
+    """Test context manager usage."""
+    session_id = f"test-cm-{int(time.time())}-{os.getpid()}"
 
-    results = []
-    for name, test_func in tests:
-        try:
-            passed = test_func()
-            results.append((name, passed))
-        except Exception as e:
-            print(f"\n❌ {name} crashed: {e}")
-            results.append((name, False))
+    with GibRAMIndexer(session_id=session_id, chunk_size=128) as cm_indexer:
+        stats = cm_indexer.index_documents(
+            ["Test document for context manager."], show_progress=False
+        )
+        assert stats.documents_indexed == 1
 
-    # Summary
-    print("=" * 60)
-    print("Test Summary")
-    print("=" * 60 + "\n")
 
-    passed_count = sum(1 for _, passed in results if passed)
-    total_count = len(results)
+def test_error_handling(monkeypatch):
+    """Test error handling."""
+    # Missing session_id
+    with pytest.raises(ConfigurationError):
+        GibRAMIndexer(session_id="")
 
-    for name, passed in results:
-        status = "✅ PASSED" if passed else "❌ FAILED"
-        print(f"{status}: {name}")
+    # Missing API key
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with pytest.raises(ConfigurationError):
+        GibRAMIndexer(session_id="test-error")
 
-    print(f"\n{passed_count}/{total_count} tests passed")
 
-    if passed_count == total_count:
-        print("\n🎉 All tests passed!")
-        sys.exit(0)
-    else:
-        print(f"\n❌ {total_count - passed_count} test(s) failed")
-        sys.exit(1)
+def test_query_modes(indexer):
+    """Test different query modes and options."""
+    indexer.index_documents(
+        ["Machine learning is a subset of artificial intelligence."],
+        show_progress=False,
+    )
+
+    # Entity-only query
+    result = indexer.query(
+        "machine learning",
+        include_entities=True,
+        include_text_units=False,
+        include_communities=False,
+        count_only=True,
+    )
+    assert result.text_unit_count == 0, "Should not return text units"
+
+    # Text-unit-only query
+    result = indexer.query(
+        "artificial intelligence",
+        include_entities=False,
+        include_text_units=True,
+        include_communities=False,
+        count_only=True,
+    )
+    assert result.entity_count == 0, "Should not return entities"
+
+
+def test_index_stream(indexer, monkeypatch):
+    """Test streaming indexing: per-document stats and cross-document relationships."""
+    marie = "Marie Curie discovered polonium together with her husband."
+    pierre = "Pierre Curie studied piezoelectricity."
+
+    # Marie's relationship points at an entity first seen in the *next* document,
+    # so it can only be stored after that document has been written
+    extractor = ScriptedExtractor(
+        {
+            marie: (
+                [ExtractedEntity("Marie Curie", "Person", "Physicist and chemist")],
+                [
+                    ExtractedRelationship(
+                        "Marie Curie", "Pierre Curie", "MARRIED_TO", "Married in 1895"
+                    )
+                ],
+            ),
+            pierre: ([ExtractedEntity("Pierre Curie", "Person", "Physicist")], []),
+        }
+    )
+    monkeypatch.setattr(indexer, "_extractor", extractor)
+
+    async def consume():
+        return [stats async for stats in indexer.index_stream([marie, pierre], batch_size=2)]
+
+    streamed = asyncio.run(consume())
+    totals = indexer.get_stats()
+
+    print(f"Streamed {len(streamed)} stats updates: {totals}")
+
+    assert sum(s.documents_indexed for s in streamed) == totals.documents_indexed == 2
+    assert sum(s.text_units_created for s in streamed) == totals.text_units_created == 2
+    assert sum(s.entities_extracted for s in streamed) == totals.entities_extracted == 2
+    assert sum(s.communities_detected for s in streamed) == totals.communities_detected
+    assert (
+        sum(s.relationships_extracted for s in streamed) == totals.relationships_extracted == 1
+    ), "Cross-document relationship should be stored"
+
+    # Nothing is stored for the first document's relationship until the end
+    assert streamed[0].relationships_extracted == 0
+    assert streamed[-1].documents_indexed == 0, "Deferred work is reported in a final update"
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__, "-v"]))